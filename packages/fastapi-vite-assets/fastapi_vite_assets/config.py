@@ -2,7 +2,8 @@
 
 import json
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import cached_property
 from pathlib import Path
 from typing import Optional
 
@@ -25,6 +26,18 @@ class ViteConfig:
         warn_on_missing_assets: Warn if assets directory missing in production (default: True)
         warn_on_missing_manifest: Warn if manifest file missing in production (default: True)
         strict_mode: Raise exceptions instead of warnings for validation errors (default: False)
+        manifest_shards_glob: Glob matching split manifest files next to manifest_path,
+            e.g. "manifest-*.json"; loaded in parallel and merged (default: None)
+        preload_entries: Entries whose imports are sent as `Link: rel=modulepreload`
+            headers on HTML responses in production (default: None)
+        optimize_templates: In production, disable Jinja2 template auto-reload
+            (default: True)
+        bytecode_cache_dir: Directory (relative to base_path) for a Jinja2
+            filesystem bytecode cache in production, created if missing; only
+            used with optimize_templates (default: None, no bytecode cache)
+        index_static_files: In production, serve built assets from an index of
+            the assets directory taken at startup; files added later are not
+            served until restart (default: False)
     """
 
     assets_path: str = "dist"
@@ -38,6 +51,14 @@ class ViteConfig:
     warn_on_missing_assets: bool = True
     warn_on_missing_manifest: bool = True
     strict_mode: bool = False
+    manifest_shards_glob: Optional[str] = None
+    preload_entries: Optional[list[str]] = None
+    optimize_templates: bool = True
+    bytecode_cache_dir: Optional[str] = None
+    index_static_files: bool = False
+    _dev_host: Optional[str] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     def __post_init__(self):
         """Initialize computed properties."""
@@ -53,7 +74,13 @@ class ViteConfig:
 
     @property
     def is_dev_mode(self) -> bool:
-        """Check if running in development mode."""
+        """Check if running in development mode.
+
+        With force_dev_mode set (or auto_detect_dev off) the answer is fixed and
+        costs nothing to compute. When auto-detecting, ENV is deliberately read
+        on every access so the mode follows the environment; set
+        force_dev_mode to pin it and skip the lookup on hot paths.
+        """
         if self.force_dev_mode is not None:
             return self.force_dev_mode
 
@@ -62,26 +89,32 @@ class ViteConfig:
 
         return False
 
-    @property
+    @cached_property
     def full_assets_path(self) -> Path:
-        """Get the full path to assets directory."""
+        """Get the full path to assets directory (computed once)."""
         assert self.base_path is not None  # Always set in __post_init__
         return self.base_path / self.assets_path
 
-    @property
+    @cached_property
     def full_manifest_path(self) -> Path:
-        """Get the full path to manifest file."""
+        """Get the full path to manifest file (computed once)."""
         assert self.base_path is not None  # Always set in __post_init__
         assert self.manifest_path is not None  # Always set in __post_init__
         return self.base_path / self.manifest_path
 
     def get_dev_server_host(self) -> str:
-        """Get Vite dev server host from env or config."""
-        if "VITE_HOST" in os.environ:
-            host = os.getenv("VITE_HOST", "localhost")
-            port = os.getenv("VITE_PORT", "5173")
-            return f"http://{host}:{port}"
-        return self.dev_server_url
+        """Get Vite dev server host from env or config.
+
+        Resolved on first call and cached for the lifetime of the config.
+        """
+        if self._dev_host is None:
+            if "VITE_HOST" in os.environ:
+                host = os.getenv("VITE_HOST", "localhost")
+                port = os.getenv("VITE_PORT", "5173")
+                self._dev_host = f"http://{host}:{port}"
+            else:
+                self._dev_host = self.dev_server_url
+        return self._dev_host
 
     def validate(self) -> list[str]:
         """Validate configuration in production mode.
@@ -107,8 +140,17 @@ class ViteConfig:
                 f"Assets path exists but is not a directory: {self.full_assets_path}"
             )
 
-        # Check manifest file
-        if not self.full_manifest_path.exists():
+        # Check manifest file(s)
+        manifest_files: list[Path] = []
+        if self.manifest_shards_glob is not None:
+            shard_dir = self.full_manifest_path.parent
+            manifest_files = sorted(shard_dir.glob(self.manifest_shards_glob))
+            if not manifest_files:
+                issues.append(
+                    f"No manifest shards matching '{self.manifest_shards_glob}' "
+                    f"found in {shard_dir}"
+                )
+        elif not self.full_manifest_path.exists():
             issues.append(
                 f"Manifest file not found: {self.full_manifest_path}. "
                 f"Ensure vite.config.ts has 'build.manifest: true'"
@@ -118,18 +160,20 @@ class ViteConfig:
                 f"Manifest path exists but is not a file: {self.full_manifest_path}"
             )
         else:
-            # Validate JSON format
+            manifest_files.append(self.full_manifest_path)
+
+        # Validate JSON format
+        for manifest_file in manifest_files:
             try:
-                with open(self.full_manifest_path) as f:
+                with open(manifest_file) as f:
                     data = json.load(f)
                     if not isinstance(data, dict):
                         issues.append(
-                            f"Manifest file is not a JSON object: {self.full_manifest_path}"
+                            f"Manifest file is not a JSON object: {manifest_file}"
                         )
             except json.JSONDecodeError as e:
                 issues.append(
-                    f"Manifest file is not valid JSON: {self.full_manifest_path}. "
-                    f"Error: {e}"
+                    f"Manifest file is not valid JSON: {manifest_file}. Error: {e}"
                 )
 
         return issues
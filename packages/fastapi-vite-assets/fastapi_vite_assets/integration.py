@@ -1,12 +1,18 @@
 """FastAPI integration for Vite."""
 
+import os
+
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
+from jinja2 import FileSystemBytecodeCache
+from jinja2.runtime import Context
 
 from .config import ViteConfig
 from .logger import logger
-from .template_helpers import ViteTemplateHelpers
+from .middleware import VitePreloadMiddleware
+from .static_files import IndexedStaticFiles
+from .template_helpers import ViteContext, ViteTemplateHelpers
 
 
 def setup_vite(
@@ -18,9 +24,13 @@ def setup_vite(
 
     This function:
     1. Validates configuration (if enabled)
-    2. Registers Jinja2 template functions for asset injection
-    3. Mounts static file serving for production builds
-    4. Logs configuration and any issues
+    2. Loads the manifest in production so requests are served from memory
+    3. Registers Jinja2 template functions for asset injection
+    4. Disables template auto-reload in production (if enabled), caching
+       bytecode in config.bytecode_cache_dir if set
+    5. Mounts static file serving for production builds
+    6. Adds `Link` modulepreload headers for config.preload_entries
+    7. Logs configuration and any issues
 
     Args:
         app: FastAPI application instance
@@ -68,19 +78,69 @@ def setup_vite(
                 else:
                     logger.warning(issue)
 
-    # Create template helpers
+    # Create template helpers, resolving which build outputs exist once here
+    # rather than on the render path
     helpers = ViteTemplateHelpers(config)
+    helpers.has_assets = config.full_assets_path.exists()
+    helpers.has_manifest = helpers.manifest.exists()
+
+    # Load the manifest and render asset tags up front in production so the
+    # first request doesn't pay for reading and parsing it
+    if not config.is_dev_mode and helpers.has_manifest:
+        helpers.manifest.render_tags(config.static_url_prefix)
+        logger.debug(f"Preloaded manifest: {config.full_manifest_path}")
 
     # Register Jinja2 functions
     template_functions = helpers.create_jinja_functions()
     templates.env.globals.update(template_functions)
     logger.debug("Registered Jinja2 template functions: vite_hmr_client, vite_asset")
 
+    # Give each render its emitted-stylesheet set up front, so stylesheets are
+    # deduplicated even when an include calls vite_asset() before the page does.
+    # A custom context class is left alone; dedupe then starts on first use.
+    if templates.env.context_class is Context:
+        templates.env.context_class = ViteContext
+    else:
+        logger.debug(
+            "Custom Jinja2 context class in use; stylesheets emitted from "
+            "includes may be linked again by the including template"
+        )
+
+    # Templates don't change in production: skip the per-render mtime check.
+    # Dev mode keeps the defaults so edits reload.
+    if config.optimize_templates and not config.is_dev_mode:
+        templates.env.auto_reload = False
+        logger.debug("Disabled template auto-reload")
+
+        # Keeping compiled templates across restarts needs a writable directory,
+        # which read-only containers lack, so it is opt-in
+        if config.bytecode_cache_dir and templates.env.bytecode_cache is None:
+            assert config.base_path is not None  # Always set in __post_init__
+            cache_dir = config.base_path / config.bytecode_cache_dir
+            try:
+                cache_dir.mkdir(parents=True, exist_ok=True)
+                if not os.access(cache_dir, os.W_OK):
+                    raise PermissionError(f"{cache_dir} is not writable")
+            except OSError as e:
+                logger.warning(
+                    f"Template bytecode cache disabled: cannot use {cache_dir}: {e}"
+                )
+            else:
+                templates.env.bytecode_cache = FileSystemBytecodeCache(str(cache_dir))
+                logger.debug(f"Enabled template bytecode cache in {cache_dir}")
+
     # Mount static files for production
-    if config.full_assets_path.exists():
+    if helpers.has_assets:
+        # Opt-in: serve an immutable production build from a startup index.
+        # Dev mode always uses plain StaticFiles to pick up rebuilds.
+        static_files_class = (
+            IndexedStaticFiles
+            if config.index_static_files and not config.is_dev_mode
+            else StaticFiles
+        )
         app.mount(
             config.static_url_prefix,
-            StaticFiles(directory=str(config.full_assets_path)),
+            static_files_class(directory=str(config.full_assets_path)),
             name="static",
         )
         logger.info(
@@ -97,4 +157,16 @@ def setup_vite(
                 f"Assets directory not found (OK in dev mode): {config.full_assets_path}"
             )
 
+    # Preload entry imports via Link headers in production. The header is
+    # rebuilt per response so it tracks manifest rebuilds.
+    if config.preload_entries and not config.is_dev_mode and helpers.has_manifest:
+        app.add_middleware(
+            VitePreloadMiddleware,
+            helpers=helpers,
+            entries=config.preload_entries,
+        )
+        logger.info(
+            f"Added modulepreload Link headers for entries: {config.preload_entries}"
+        )
+
     return helpers
@@ -1,54 +1,313 @@
 """Vite manifest reader for production builds."""
 
 import json
+import mmap
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from markupsafe import Markup
 
 from .logger import logger
 
+# Prefer orjson when installed (the "performance" extra); it parses bytes
+# directly and is several times faster than the stdlib scanner.
+_loads: Callable[[Any], Any]
+try:
+    import orjson
+
+    _loads = orjson.loads
+    _HAS_ORJSON = True
+except ImportError:  # pragma: no cover - depends on installed extras
+    _loads = json.loads
+    _HAS_ORJSON = False
+
+# Manifests at least this large are memory-mapped rather than read into a
+# bytes copy (orjson only; the stdlib parser needs bytes or str)
+_MMAP_THRESHOLD = 1024 * 1024
+
+
+# Upper bound on threads used to read split manifest shards
+_MAX_SHARD_WORKERS = 8
+
+# Bits of ChunkInfo.flags
+CHUNK_HAS_CSS = 1 << 0
+CHUNK_HAS_IMPORTS = 1 << 1
+
+
+class ChunkInfo(NamedTuple):
+    """Classification of a manifest chunk, computed once at parse time."""
+
+    kind: str  # "css" or "js"
+    flags: int  # CHUNK_HAS_CSS | CHUNK_HAS_IMPORTS; 0 for leaf chunks
+
+
+# A parsed manifest paired with the ChunkInfo of each entry. The pair is only
+# ever replaced as a whole, so concurrent renders never see one manifest
+# combined with another's classification.
+LoadedManifest = Tuple[Dict, Dict[str, ChunkInfo]]
+
+# Parsed manifests shared across ViteManifest instances, keyed by manifest path.
+# Each entry stores the file mtime (ns), or the manifest directory's inode and
+# mtime for split manifests, so a rebuilt manifest is re-parsed.
+_MANIFEST_CACHE: Dict[str, Tuple[Any, LoadedManifest]] = {}
+
+# Separator between the tags rendered for a single entry
+_TAG_SEPARATOR = "\n    "
+
+# A rendered tag paired with the stylesheet it links (None for scripts)
+TagPart = Tuple[Optional[str], str]
+
+# Rendered tag blocks keyed by (manifest path, static URL prefix). Each entry
+# remembers the parsed manifest it was built from, so once load() re-reads a
+# rebuilt manifest the stale tags are no longer returned.
+_TAGS_CACHE: Dict[Tuple[str, str], Tuple[Dict, Dict[str, Markup]]] = {}
+
+# Individual tags per entry, cached the same way as _TAGS_CACHE
+_TAG_PARTS_CACHE: Dict[
+    Tuple[str, str], Tuple[Dict, Dict[str, Tuple[TagPart, ...]]]
+] = {}
+
+# `Link` preload header values, cached the same way as _TAGS_CACHE
+_PRELOAD_CACHE: Dict[Tuple[str, str], Tuple[Dict, Dict[str, str]]] = {}
+
+
+def _read_manifest(path: Path) -> Any:
+    """Read and parse a single manifest file."""
+    with open(path, "rb") as f:
+        if _HAS_ORJSON and os.fstat(f.fileno()).st_size >= _MMAP_THRESHOLD:
+            # orjson parses straight from the page cache via the buffer protocol
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                with memoryview(mm) as view:
+                    return _loads(view)
+        return _loads(f.read())
+
+
+def _classify(manifest: Dict) -> Dict[str, ChunkInfo]:
+    """Classify each chunk by kind and dependency flags once at parse time.
+
+    The chunks themselves are left untouched. Leaf chunks (flags == 0) can
+    skip dependency handling.
+    """
+    info: Dict[str, ChunkInfo] = {}
+    for entry, chunk in manifest.items():
+        if not isinstance(chunk, dict):
+            continue
+        if entry.endswith(".css") or chunk.get("file", "").endswith(".css"):
+            kind = "css"
+        else:
+            kind = "js"
+        flags = (CHUNK_HAS_CSS if chunk.get("css") else 0) | (
+            CHUNK_HAS_IMPORTS if chunk.get("imports") else 0
+        )
+        info[entry] = ChunkInfo(kind, flags)
+    return info
+
+
+def _collect_preload_files(loaded: LoadedManifest, entry: str) -> List[str]:
+    """Collect the files an entry transitively imports from one manifest pair."""
+    manifest, chunk_info = loaded
+    files: List[str] = []
+    seen = set()
+    queue = deque([entry])
+    while queue:
+        name = queue.popleft()
+        if name in seen:
+            continue
+        seen.add(name)
+
+        info = chunk_info.get(name)
+        if info is None:
+            continue
+        chunk = manifest[name]
+        if name != entry and chunk.get("file"):
+            files.append(chunk["file"])
+        if info.flags & CHUNK_HAS_IMPORTS:
+            queue.extend(chunk["imports"])
+
+    return files
+
 
 class ViteManifest:
     """Handles reading and parsing the Vite manifest file."""
 
-    def __init__(self, manifest_path: Path):
+    def __init__(self, manifest_path: Path, shards_glob: Optional[str] = None):
         """Initialize the manifest reader.
 
         Args:
             manifest_path: Path to the manifest.json file
+            shards_glob: Glob matching split manifest files in the manifest's
+                directory (e.g. "manifest-*.json"). When set, the shards are
+                loaded and merged instead of manifest_path.
         """
         self.manifest_path = manifest_path
-        self._manifest: Optional[Dict] = None
+        self.shards_glob = shards_glob
+        # Assigned in a single store; methods read it once per call
+        self._loaded: Optional[LoadedManifest] = None
+
+        if shards_glob is None:
+            self._cache_key = str(manifest_path)
+        else:
+            self._cache_key = str(manifest_path.parent / shards_glob)
 
     def load(self) -> Dict:
         """Load and parse the manifest file.
 
+        Parsed manifests are cached per path for the lifetime of the process and
+        only re-read when the file's modification time changes. Each call stats
+        the file; the other methods reuse the manifest from the last load() and
+        only call it when nothing has been loaded yet.
+
+        If the file disappears or can't be read or parsed (e.g. while a build
+        is rewriting it), the last successfully loaded manifest keeps being
+        served.
+
         Returns:
-            Dictionary containing the manifest data, or empty dict if file doesn't exist
+            Dictionary containing the manifest data, or empty dict if no manifest
+            has been loaded successfully
         """
-        if not self.manifest_path.exists():
+        return self._load()[0]
+
+    def _load(self) -> LoadedManifest:
+        """Load the manifest and its chunk classification as one pair."""
+        if self.shards_glob is not None:
+            return self._load_shards(self.shards_glob)
+
+        try:
+            st = self.manifest_path.stat()
+        except FileNotFoundError:
             logger.debug(
                 f"Manifest file not found: {self.manifest_path}. "
-                f"Returning empty manifest (OK in development mode)."
+                f"Returning last loaded or empty manifest (OK in development mode)."
+            )
+            return self._last_loaded()
+        except OSError as e:
+            logger.error(f"Failed to stat manifest at {self.manifest_path}: {e}.")
+            return self._last_loaded()
+
+        cached = _MANIFEST_CACHE.get(self._cache_key)
+        if cached is not None and cached[0] == st.st_mtime_ns:
+            self._loaded = cached[1]
+            return cached[1]
+
+        try:
+            manifest = _read_manifest(self.manifest_path)
+            chunk_info = _classify(manifest)
+        # Covers files deleted or replaced mid-build (OSError) and partial
+        # writes: json/orjson decode errors and UnicodeDecodeError are ValueErrors
+        except OSError as e:
+            logger.error(
+                f"Failed to read manifest at {self.manifest_path}: {e}. "
+                f"Returning last loaded or empty manifest."
             )
-            return {}
+            return self._last_loaded()
+        except ValueError as e:
+            logger.error(
+                f"Failed to parse manifest at {self.manifest_path}: {e}. "
+                f"Returning last loaded or empty manifest."
+            )
+            return self._last_loaded()
+
+        loaded = (manifest, chunk_info)
+        self._loaded = loaded
 
+        entry_count = len(manifest) if manifest else 0
+        logger.debug(
+            f"Loaded manifest with {entry_count} entries from {self.manifest_path}"
+        )
+
+        _MANIFEST_CACHE[self._cache_key] = (st.st_mtime_ns, loaded)
+        return loaded
+
+    def _last_loaded(self) -> LoadedManifest:
+        """Return the last successfully loaded manifest, or an empty one."""
+        loaded = self._loaded
+        return loaded if loaded is not None else ({}, {})
+
+    def _snapshot(self) -> LoadedManifest:
+        """Return the current manifest pair, loading it on first use."""
+        loaded = self._loaded
+        return loaded if loaded is not None else self._load()
+
+    def _load_shards(self, shards_glob: str) -> LoadedManifest:
+        """Load and merge split manifest files, reading them concurrently.
+
+        Only the manifest directory is stat'ed to check for changes, so a cache
+        hit costs one stat however many shards there are. The shards are
+        re-globbed and re-read when the directory's mtime or inode changes,
+        which happens when a build adds, removes or renames shards or recreates
+        the directory (Vite's default emptyOutDir). Shards rewritten in place
+        without any of those are not picked up until the directory changes.
+
+        Args:
+            shards_glob: Glob matching the shards in the manifest directory
+
+        Returns:
+            Merged manifest data and its chunk classification, or the last
+            loaded (else empty) pair if no shards match or they can't be read
+        """
+        shard_dir = self.manifest_path.parent
         try:
-            with open(self.manifest_path, "r") as f:
-                self._manifest = json.load(f)
+            dir_st = shard_dir.stat()
+        except FileNotFoundError:
+            dir_st = None
+        except OSError as e:
+            logger.error(f"Failed to stat manifest directory {shard_dir}: {e}.")
+            return self._last_loaded()
+
+        stamp = (dir_st.st_ino, dir_st.st_mtime_ns) if dir_st is not None else None
+        cached = _MANIFEST_CACHE.get(self._cache_key)
+        if stamp is not None and cached is not None and cached[0] == stamp:
+            self._loaded = cached[1]
+            return cached[1]
 
-            entry_count = len(self._manifest) if self._manifest else 0
+        shard_paths = sorted(shard_dir.glob(shards_glob)) if dir_st is not None else []
+        if not shard_paths:
             logger.debug(
-                f"Loaded manifest with {entry_count} entries from {self.manifest_path}"
+                f"No manifest shards matching '{shards_glob}' in {shard_dir}. "
+                f"Returning last loaded or empty manifest (OK in development mode)."
             )
+            return self._last_loaded()
 
-            return self._manifest
-
-        except json.JSONDecodeError as e:
+        workers = min(_MAX_SHARD_WORKERS, len(shard_paths), os.cpu_count() or 1)
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                shards = list(executor.map(_read_manifest, shard_paths))
+        # A shard removed between glob and open() mid-build raises OSError
+        except OSError as e:
             logger.error(
-                f"Failed to parse manifest at {self.manifest_path}: {e}. "
-                f"Returning empty manifest."
+                f"Failed to read manifest shard in {shard_dir}: {e}. "
+                f"Returning last loaded or empty manifest."
             )
-            return {}
+            return self._last_loaded()
+        except ValueError as e:
+            logger.error(
+                f"Failed to parse manifest shard in {shard_dir}: {e}. "
+                f"Returning last loaded or empty manifest."
+            )
+            return self._last_loaded()
+
+        manifest: Dict = {}
+        for shard in shards:
+            manifest.update(shard)
+        loaded = (manifest, _classify(manifest))
+        self._loaded = loaded
+
+        logger.debug(
+            f"Loaded manifest with {len(manifest)} entries from "
+            f"{len(shard_paths)} shards in {shard_dir}"
+        )
+
+        _MANIFEST_CACHE[self._cache_key] = (stamp, loaded)
+        return loaded
+
+    def exists(self) -> bool:
+        """Check whether the manifest (or any of its shards) exists on disk."""
+        if self.shards_glob is not None:
+            return any(self.manifest_path.parent.glob(self.shards_glob))
+        return self.manifest_path.is_file()
 
     def get_chunk(self, entry: str) -> Optional[Dict]:
         """Get a specific chunk from the manifest.
@@ -59,7 +318,165 @@ class ViteManifest:
         Returns:
             Chunk data dictionary or None if not found
         """
-        if self._manifest is None:
-            self.load()
+        manifest, _ = self._snapshot()
+        return manifest.get(entry)
+
+    def get_chunk_info(self, entry: str) -> Optional[ChunkInfo]:
+        """Get the parse-time classification of a specific chunk.
+
+        Args:
+            entry: Entry name (e.g., "src/main.ts")
+
+        Returns:
+            ChunkInfo for the chunk or None if not found
+        """
+        _, chunk_info = self._snapshot()
+        return chunk_info.get(entry)
+
+    def render_tags(self, static_url_prefix: str) -> Dict[str, Markup]:
+        """Render the HTML tags for every manifest entry.
+
+        Each entry maps to its script or stylesheet tag followed by stylesheet
+        tags for any CSS it references. The result is cached alongside the
+        parsed manifest, so repeated calls are a single dictionary lookup.
+
+        Args:
+            static_url_prefix: URL prefix the built assets are served from
+
+        Returns:
+            Dictionary of entry name to rendered tag block
+        """
+        loaded = self._snapshot()
+        manifest = loaded[0]
+
+        key = (self._cache_key, static_url_prefix)
+        cached = _TAGS_CACHE.get(key)
+        if cached is not None and cached[0] is manifest:
+            return cached[1]
+
+        rendered = {
+            entry: Markup(_TAG_SEPARATOR.join(tag for _, tag in parts))
+            for entry, parts in self._render_tag_parts(
+                loaded, static_url_prefix
+            ).items()
+        }
+
+        if manifest:
+            _TAGS_CACHE[key] = (manifest, rendered)
+        return rendered
+
+    def render_tag_parts(
+        self, static_url_prefix: str
+    ) -> Dict[str, Tuple[TagPart, ...]]:
+        """Render the individual HTML tags for every manifest entry.
+
+        Like render_tags(), but keeps each tag separate and paired with the
+        stylesheet it links, so callers can drop stylesheets already on the page.
+
+        Args:
+            static_url_prefix: URL prefix the built assets are served from
+
+        Returns:
+            Dictionary of entry name to (stylesheet or None, tag) pairs
+        """
+        return self._render_tag_parts(self._snapshot(), static_url_prefix)
+
+    def _render_tag_parts(
+        self, loaded: LoadedManifest, static_url_prefix: str
+    ) -> Dict[str, Tuple[TagPart, ...]]:
+        """Render the individual tags of one manifest snapshot."""
+        manifest, chunk_info = loaded
+
+        key = (self._cache_key, static_url_prefix)
+        cached = _TAG_PARTS_CACHE.get(key)
+        if cached is not None and cached[0] is manifest:
+            return cached[1]
+
+        # Chunks routinely share CSS, so each stylesheet tag is formatted once
+        # and the same string object reused by every entry that references it
+        stylesheet_tags: Dict[str, TagPart] = {}
+
+        def stylesheet(file_path: str) -> TagPart:
+            part = stylesheet_tags.get(file_path)
+            if part is None:
+                part = (
+                    file_path,
+                    f'<link rel="stylesheet" href="{static_url_prefix}/{file_path}">',
+                )
+                stylesheet_tags[file_path] = part
+            return part
+
+        rendered: Dict[str, Tuple[TagPart, ...]] = {}
+        for entry, chunk in manifest.items():
+            info = chunk_info.get(entry)
+            if info is None:
+                continue
+
+            tags: List[TagPart] = []
+            file_path = chunk.get("file")
+
+            if file_path:
+                if info.kind == "css":
+                    tags.append(stylesheet(file_path))
+                else:
+                    tags.append(
+                        (
+                            None,
+                            f'<script type="module" src="{static_url_prefix}/{file_path}"></script>',
+                        )
+                    )
+
+            # Include CSS files referenced by this chunk
+            if info.flags & CHUNK_HAS_CSS:
+                for css_file in chunk["css"]:
+                    tags.append(stylesheet(css_file))
+
+            rendered[entry] = tuple(tags)
+
+        if manifest:
+            _TAG_PARTS_CACHE[key] = (manifest, rendered)
+        return rendered
+
+    def collect_preload_files(self, entry: str) -> List[str]:
+        """Collect the files of every chunk an entry transitively imports.
+
+        Args:
+            entry: Entry name (e.g., "src/main.ts")
+
+        Returns:
+            Built file paths in breadth-first import order, each listed once
+        """
+        return _collect_preload_files(self._snapshot(), entry)
+
+    def preload_headers(self, static_url_prefix: str) -> Dict[str, str]:
+        """Build `Link` header values that modulepreload each entry's imports.
+
+        Entries without imports are omitted. Like render_tags(), the result is
+        cached alongside the parsed manifest.
+
+        Args:
+            static_url_prefix: URL prefix the built assets are served from
+
+        Returns:
+            Dictionary of entry name to `Link` header value
+        """
+        loaded = self._snapshot()
+        manifest = loaded[0]
+
+        key = (self._cache_key, static_url_prefix)
+        cached = _PRELOAD_CACHE.get(key)
+        if cached is not None and cached[0] is manifest:
+            return cached[1]
+
+        headers: Dict[str, str] = {}
+        for entry in manifest:
+            files = _collect_preload_files(loaded, entry)
+            if files:
+                headers[entry] = ", ".join(
+                    f"<{static_url_prefix}/{file_path}>; rel=modulepreload; crossorigin"
+                    for file_path in files
+                )
 
-        return self._manifest.get(entry) if self._manifest else None
+        if manifest:
+            _PRELOAD_CACHE[key] = (manifest, headers)
+        return headers
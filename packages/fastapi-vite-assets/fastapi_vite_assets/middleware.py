@@ -0,0 +1,48 @@
+"""ASGI middleware for Vite integration."""
+
+from typing import Sequence
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .template_helpers import ViteTemplateHelpers
+
+
+class VitePreloadMiddleware:
+    """Add a `Link` modulepreload header to HTML responses.
+
+    The header lets browsers start fetching JavaScript chunks before the HTML
+    body has been parsed. It is built per response from the helpers' manifest,
+    so it follows a rebuilt manifest like the rendered tags do; on a cache hit
+    that is one stat and a dictionary lookup.
+    """
+
+    def __init__(
+        self, app: ASGIApp, helpers: ViteTemplateHelpers, entries: Sequence[str]
+    ):
+        """Initialize the middleware.
+
+        Args:
+            app: ASGI application to wrap
+            helpers: Template helpers whose manifest supplies the imports
+            entries: Entry paths whose imports are preloaded
+        """
+        self.app = app
+        self.helpers = helpers
+        self.entries = tuple(entries)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_link(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                if headers.get("content-type", "").startswith("text/html"):
+                    link_header = self.helpers.preload_header(*self.entries)
+                    if link_header:
+                        headers.append("Link", link_header)
+            await send(message)
+
+        await self.app(scope, receive, send_with_link)
@@ -0,0 +1,74 @@
+"""Static file serving for production Vite builds."""
+
+import os
+
+from fastapi.staticfiles import StaticFiles
+
+from .logger import logger
+
+
+class IndexedStaticFiles(StaticFiles):
+    """StaticFiles that serves from an index of the build directory.
+
+    Vite builds are immutable once deployed, so the directory is walked once at
+    startup. Requests resolve with a dictionary lookup instead of per-request
+    path joining, realpath() and containment checks; anything not in the index
+    (including traversal attempts) is a 404. Files added after startup are not
+    served until the app restarts. Responses are still Starlette FileResponses,
+    which use zero-copy sending when the ASGI server supports the
+    `http.response.pathsend` extension.
+    """
+
+    def __init__(self, *, directory: str | os.PathLike[str]):
+        """Initialize and index the directory.
+
+        Args:
+            directory: Build output directory to serve
+        """
+        super().__init__(directory=directory)
+        self._index = self._build_index(os.fspath(directory))
+        logger.debug(f"Indexed {len(self._index)} static files in {directory}")
+
+    @staticmethod
+    def _build_index(directory: str) -> dict[str, str]:
+        """Map each file's relative path to its resolved absolute path.
+
+        Symlinked files and directories are followed, like StaticFiles does,
+        unless they resolve outside the directory (matching StaticFiles' default
+        containment rule). A directory symlink pointing back at one of its own
+        ancestors is skipped so the walk terminates.
+        """
+        root = os.path.realpath(directory)
+        index: dict[str, str] = {}
+        # Resolved paths of each walked directory and its ancestors
+        ancestors: dict[str, frozenset[str]] = {root: frozenset([root])}
+        for dirpath, dirnames, filenames in os.walk(root, followlinks=True):
+            seen = ancestors.pop(dirpath)
+            kept = []
+            for dirname in dirnames:
+                subdir = os.path.join(dirpath, dirname)
+                real_subdir = os.path.realpath(subdir)
+                if real_subdir in seen:
+                    continue
+                if os.path.commonpath([real_subdir, root]) != root:
+                    continue
+                ancestors[subdir] = seen | {real_subdir}
+                kept.append(dirname)
+            dirnames[:] = kept
+
+            for filename in filenames:
+                full_path = os.path.realpath(os.path.join(dirpath, filename))
+                if os.path.commonpath([full_path, root]) != root:
+                    continue
+                relative = os.path.relpath(os.path.join(dirpath, filename), root)
+                index[relative] = full_path
+        return index
+
+    def lookup_path(self, path: str) -> tuple[str, os.stat_result | None]:
+        full_path = self._index.get(path)
+        if full_path is None:
+            return "", None
+        try:
+            return full_path, os.stat(full_path)
+        except (FileNotFoundError, NotADirectoryError):
+            return "", None
@@ -1,11 +1,59 @@
 """Jinja2 template helper functions for Vite asset injection."""
 
+from typing import Final
+
 from jinja2 import pass_context
+from jinja2.runtime import Context
 from markupsafe import Markup
 
 from .config import ViteConfig
 from .logger import logger
-from .manifest import ViteManifest
+from .manifest import _TAG_SEPARATOR, ViteManifest
+
+_DEV_CSS_TPL = '<link rel="stylesheet" href="%s">'
+_DEV_JS_TPL = '<script type="module" src="%s"></script>'
+_EMPTY_MARKUP: Final[Markup] = Markup("")
+
+# Render-context variable holding the stylesheets already emitted on a page
+_EMITTED_CSS_VAR = "_vite_emitted_css"
+
+
+def _emitted_css(context) -> set[str] | None:
+    """Get the set of stylesheets already emitted during this render.
+
+    With ViteContext installed (setup_vite() does this), every render starts
+    with the set in its root context. Blocks render in that same context, and
+    an {% include %} gets the includer's variables as its parent, so the lookup
+    finds the one set wherever vite_asset() is first called. Under another
+    context class, the set is created on first use instead, and an include
+    that calls vite_asset() before its includer gets a set of its own.
+
+    Args:
+        context: Jinja2 render context
+
+    Returns:
+        Mutable set of stylesheet files, or None if the context has no vars
+    """
+    context_vars = getattr(context, "vars", None)
+    if context_vars is None:
+        return None
+    emitted = context.get(_EMITTED_CSS_VAR)
+    if emitted is None:
+        emitted = context_vars[_EMITTED_CSS_VAR] = set()
+    return emitted
+
+
+class ViteContext(Context):
+    """Jinja2 context that starts each render with an emitted-stylesheet set.
+
+    Contexts created for includes and derived scopes inherit the set through
+    their parent, so only a render's root context creates one.
+    """
+
+    def __init__(self, environment, parent, name, blocks, globals=None):
+        super().__init__(environment, parent, name, blocks, globals=globals)
+        if _EMITTED_CSS_VAR not in parent:
+            self.vars[_EMITTED_CSS_VAR] = set()
 
 
 class ViteTemplateHelpers:
@@ -19,12 +67,17 @@ class ViteTemplateHelpers:
         """
         self.config = config
         self._manifest: ViteManifest | None = None
+        # Resolved once by setup_vite(); assume present until then
+        self.has_assets = True
+        self.has_manifest = True
 
     @property
     def manifest(self) -> ViteManifest:
         """Lazy-load the Vite manifest."""
         if self._manifest is None:
-            self._manifest = ViteManifest(self.config.full_manifest_path)
+            self._manifest = ViteManifest(
+                self.config.full_manifest_path, self.config.manifest_shards_glob
+            )
         return self._manifest
 
     def vite_hmr_client(self) -> Markup:
@@ -34,14 +87,12 @@ class ViteTemplateHelpers:
             HTML script tag for Vite client in dev mode, empty string in production
         """
         if not self.config.is_dev_mode:
-            return Markup("")
+            return _EMPTY_MARKUP
 
         dev_server = self.config.get_dev_server_host()
-        return Markup(
-            f'<script type="module" src="{dev_server}/@vite/client"></script>'
-        )
+        return Markup(_DEV_JS_TPL % (dev_server + "/@vite/client"))
 
-    def vite_asset(self, path: str) -> Markup:
+    def vite_asset(self, path: str, emitted_css: set[str] | None = None) -> Markup:
         """Inject Vite asset tags (script or link).
 
         In development: points to Vite dev server
@@ -49,13 +100,15 @@ class ViteTemplateHelpers:
 
         Args:
             path: Asset path (e.g., "src/main.ts")
+            emitted_css: Stylesheets already on the page; these are skipped and
+                newly emitted ones are added (production only)
 
         Returns:
             HTML tag(s) for the asset
         """
         if self.config.is_dev_mode:
             return self._dev_asset(path)
-        return self._prod_asset(path)
+        return self._prod_asset(path, emitted_css)
 
     def _dev_asset(self, path: str) -> Markup:
         """Generate asset tag for development mode.
@@ -66,54 +119,80 @@ class ViteTemplateHelpers:
         Returns:
             HTML tag pointing to Vite dev server
         """
-        dev_server = self.config.get_dev_server_host()
-        url = f"{dev_server}/{path}"
+        url = self.config.get_dev_server_host() + "/" + path
 
         if path.endswith(".css"):
-            return Markup(f'<link rel="stylesheet" href="{url}">')
+            return Markup(_DEV_CSS_TPL % url)
         else:
-            return Markup(f'<script type="module" src="{url}"></script>')
+            return Markup(_DEV_JS_TPL % url)
 
-    def _prod_asset(self, path: str) -> Markup:
+    def _prod_asset(self, path: str, emitted_css: set[str] | None = None) -> Markup:
         """Generate asset tag(s) for production mode.
 
         Args:
             path: Asset path
+            emitted_css: Stylesheets already on the page, or None to emit all
 
         Returns:
             HTML tag(s) for the built asset and its dependencies
         """
-        chunk = self.manifest.get_chunk(path)
+        if not self.has_manifest:
+            return _EMPTY_MARKUP
 
-        if not chunk:
+        # load() stats the manifest so a rebuild is picked up; the calls below
+        # then reuse the parsed manifest and its cached tags
+        manifest = self.manifest
+        manifest.load()
+        tags = manifest.render_tags(self.config.static_url_prefix).get(path)
+
+        if tags is None:
             logger.warning(
                 f"Asset '{path}' not found in manifest. "
                 f"Ensure it's listed in vite.config.ts build.rollupOptions.input"
             )
-            return Markup("")
-
-        tags = []
-        file_path = chunk.get("file")
-        static_prefix = self.config.static_url_prefix
-
-        if file_path:
-            if path.endswith(".css") or file_path.endswith(".css"):
-                tags.append(
-                    f'<link rel="stylesheet" href="{static_prefix}/{file_path}">'
-                )
-            else:
-                tags.append(
-                    f'<script type="module" src="{static_prefix}/{file_path}"></script>'
-                )
-
-        # Include CSS files referenced by this chunk
-        if "css" in chunk:
-            for css_file in chunk["css"]:
-                tags.append(
-                    f'<link rel="stylesheet" href="{static_prefix}/{css_file}">'
-                )
-
-        return Markup("\n    ".join(tags))
+            return _EMPTY_MARKUP
+
+        if emitted_css is None:
+            return tags
+
+        # Leaf script chunks link no stylesheets, so there is nothing to dedupe
+        info = manifest.get_chunk_info(path)
+        if info is not None and info.flags == 0 and info.kind == "js":
+            return tags
+
+        # A concurrent reload may have dropped the entry since render_tags()
+        parts = manifest.render_tag_parts(self.config.static_url_prefix).get(path)
+        if parts is None:
+            return tags
+        kept = []
+        for css_file, tag in parts:
+            if css_file is not None:
+                if css_file in emitted_css:
+                    continue
+                emitted_css.add(css_file)
+            kept.append(tag)
+
+        if len(kept) == len(parts):
+            return tags
+        return Markup(_TAG_SEPARATOR.join(kept))
+
+    def preload_header(self, *paths: str) -> str:
+        """Build a `Link` header that modulepreloads the imports of entries.
+
+        Args:
+            *paths: Entry paths (e.g., "src/main.ts")
+
+        Returns:
+            `Link` header value, or empty string in dev mode or if no entry
+            has imports
+        """
+        if self.config.is_dev_mode or not self.has_manifest:
+            return ""
+
+        manifest = self.manifest
+        manifest.load()
+        headers = manifest.preload_headers(self.config.static_url_prefix)
+        return ", ".join(headers[path] for path in paths if path in headers)
 
     def create_jinja_functions(self):
         """Create Jinja2-compatible functions.
@@ -121,14 +200,19 @@ class ViteTemplateHelpers:
         Returns:
             Dictionary of function names to callables
         """
+        # Bind once so each template call resolves these as closure variables
+        # rather than attribute and global lookups
+        vite_hmr_client = self.vite_hmr_client
+        vite_asset = self.vite_asset
+        emitted_css = _emitted_css
 
         @pass_context
         def hmr_client(context):
-            return self.vite_hmr_client()
+            return vite_hmr_client()
 
         @pass_context
         def asset(context, path: str):
-            return self.vite_asset(path)
+            return vite_asset(path, emitted_css(context))
 
         return {
             "vite_hmr_client": hmr_client,
@@ -0,0 +1,21 @@
+"""Shared pytest fixtures."""
+
+import pytest
+
+from fastapi_vite_assets import manifest
+
+
+@pytest.fixture(autouse=True)
+def clear_manifest_cache():
+    """Isolate tests from the process-wide manifest caches."""
+    caches = (
+        manifest._MANIFEST_CACHE,
+        manifest._TAGS_CACHE,
+        manifest._TAG_PARTS_CACHE,
+        manifest._PRELOAD_CACHE,
+    )
+    for cache in caches:
+        cache.clear()
+    yield
+    for cache in caches:
+        cache.clear()
@@ -64,6 +64,22 @@ class TestViteConfig:
         config = ViteConfig(force_dev_mode=False)
         assert config.is_dev_mode is False
 
+    def test_is_dev_mode_follows_env_when_auto_detecting(self, monkeypatch):
+        """Test auto-detected dev mode tracks ENV changes."""
+        monkeypatch.setenv("ENV", "production")
+        config = ViteConfig()
+        assert config.is_dev_mode is False
+
+        monkeypatch.setenv("ENV", "development")
+        assert config.is_dev_mode is True
+
+    def test_full_paths_cached(self):
+        """Test full paths are computed once per config."""
+        config = ViteConfig(base_path="/app")
+
+        assert config.full_assets_path is config.full_assets_path
+        assert config.full_manifest_path is config.full_manifest_path
+
     def test_full_assets_path(self):
         """Test full_assets_path property."""
         config = ViteConfig(
@@ -100,6 +116,16 @@ class TestViteConfig:
 
         assert config.get_dev_server_host() == "http://localhost:3000"
 
+    def test_get_dev_server_host_cached(self, monkeypatch):
+        """Test get_dev_server_host is resolved once per config."""
+        monkeypatch.setenv("VITE_HOST", "0.0.0.0")
+        monkeypatch.setenv("VITE_PORT", "8080")
+        config = ViteConfig()
+        assert config.get_dev_server_host() == "http://0.0.0.0:8080"
+
+        monkeypatch.setenv("VITE_PORT", "9090")
+        assert config.get_dev_server_host() == "http://0.0.0.0:8080"
+
     def test_auto_derive_manifest_path(self):
         """Test manifest_path auto-derivation from assets_path."""
         config = ViteConfig(assets_path="web/dist")
@@ -172,3 +198,23 @@ class TestViteConfig:
 
         issues = config.validate()
         assert len(issues) == 0  # No issues
+
+    def test_validate_manifest_shards(self, monkeypatch, tmp_path):
+        """Test validation checks split manifest shards when configured."""
+        monkeypatch.setenv("ENV", "production")
+        shard_dir = tmp_path / "dist" / ".vite"
+        shard_dir.mkdir(parents=True)
+
+        config = ViteConfig(
+            assets_path="dist",
+            base_path=tmp_path,
+            manifest_shards_glob="manifest-*.json",
+        )
+        assert any(
+            "No manifest shards matching" in issue for issue in config.validate()
+        )
+
+        (shard_dir / "manifest-a.json").write_text(
+            '{"src/a.ts": {"file": "assets/a.js"}}'
+        )
+        assert config.validate() == []
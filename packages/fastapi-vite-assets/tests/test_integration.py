@@ -71,6 +71,26 @@ class TestIntegration:
         routes = [route.path for route in app.routes]
         assert "/static" in routes
 
+    def test_setup_vite_static_files_index_opt_in(self, app, templates, tmp_path):
+        """Test that the startup-indexed static files are only used when enabled."""
+        from fastapi.staticfiles import StaticFiles
+
+        from fastapi_vite_assets.static_files import IndexedStaticFiles
+
+        (tmp_path / "dist").mkdir()
+
+        setup_vite(app, templates, ViteConfig(base_path=tmp_path, force_dev_mode=False))
+        mounted = next(r.app for r in app.routes if r.path == "/static")
+        assert type(mounted) is StaticFiles
+
+        app = FastAPI()
+        config = ViteConfig(
+            base_path=tmp_path, force_dev_mode=False, index_static_files=True
+        )
+        setup_vite(app, templates, config)
+        mounted = next(r.app for r in app.routes if r.path == "/static")
+        assert isinstance(mounted, IndexedStaticFiles)
+
     def test_setup_vite_skips_static_if_no_dist(self, app, templates, tmp_path):
         """Test that setup_vite doesn't mount static files if dist doesn't exist."""
         config = ViteConfig(
@@ -142,6 +162,254 @@ class TestIntegration:
         assert "/static/assets/app-BxYz123.js" in result
         assert "/static/assets/app-styles-Abc456.css" in result
 
+    def test_production_mode_preloads_manifest(self, app, templates, manifest_path):
+        """Test that setup_vite loads the manifest before the first render."""
+        config = ViteConfig(
+            assets_path="fixtures",
+            manifest_path="fixtures/manifest.json",
+            base_path=manifest_path.parent.parent,
+            force_dev_mode=False,
+        )
+
+        helpers = setup_vite(app, templates, config)
+
+        assert helpers.manifest._loaded is not None
+        assert "src/main.ts" in helpers.manifest._loaded[0]
+
+    def test_dev_mode_skips_manifest_preload(self, app, templates, manifest_path):
+        """Test that setup_vite doesn't load the manifest in dev mode."""
+        config = ViteConfig(
+            assets_path="fixtures",
+            manifest_path="fixtures/manifest.json",
+            base_path=manifest_path.parent.parent,
+            force_dev_mode=True,
+        )
+
+        helpers = setup_vite(app, templates, config)
+
+        assert helpers.manifest._loaded is None
+
+    def test_production_mode_without_manifest(self, app, templates, tmp_path, caplog):
+        """Test that assets render empty without per-call lookups if no manifest."""
+        import logging
+
+        config = ViteConfig(
+            base_path=tmp_path,
+            force_dev_mode=False,
+            validate_on_setup=False,
+        )
+
+        helpers = setup_vite(app, templates, config)
+        caplog.set_level(logging.WARNING)
+        caplog.clear()
+
+        assert helpers.has_assets is False
+        assert helpers.has_manifest is False
+        assert str(helpers.vite_asset("src/main.ts")) == ""
+        assert helpers.manifest._loaded is None
+        assert not caplog.records
+
+    def test_preload_entries_add_link_header(self, app, templates, tmp_path):
+        """Test that preload_entries adds a Link header to HTML responses."""
+        from fastapi.responses import HTMLResponse
+        from fastapi.testclient import TestClient
+
+        vite_dir = tmp_path / "dist" / ".vite"
+        vite_dir.mkdir(parents=True)
+        (vite_dir / "manifest.json").write_text(
+            '{"src/main.ts": {"file": "assets/main.js", "imports": ["_shared.js"]},'
+            ' "_shared.js": {"file": "assets/shared.js"}}'
+        )
+        config = ViteConfig(
+            base_path=tmp_path,
+            force_dev_mode=False,
+            preload_entries=["src/main.ts"],
+        )
+
+        setup_vite(app, templates, config)
+
+        @app.get("/", response_class=HTMLResponse)
+        async def index():
+            return "<html></html>"
+
+        @app.get("/api")
+        async def api():
+            return {}
+
+        client = TestClient(app)
+        assert client.get("/").headers["link"] == (
+            "</static/assets/shared.js>; rel=modulepreload; crossorigin"
+        )
+        assert "link" not in client.get("/api").headers
+
+    def test_preload_link_header_follows_rebuilt_manifest(
+        self, app, templates, tmp_path
+    ):
+        """Test that the Link header picks up a rebuilt manifest."""
+        import os
+
+        from fastapi.responses import HTMLResponse
+        from fastapi.testclient import TestClient
+
+        manifest_path = tmp_path / "dist" / ".vite" / "manifest.json"
+        manifest_path.parent.mkdir(parents=True)
+        manifest_path.write_text(
+            '{"src/main.ts": {"file": "assets/main-1.js", "imports": ["_s.js"]},'
+            ' "_s.js": {"file": "assets/s-1.js"}}'
+        )
+        config = ViteConfig(
+            base_path=tmp_path,
+            force_dev_mode=False,
+            preload_entries=["src/main.ts"],
+        )
+        setup_vite(app, templates, config)
+
+        @app.get("/", response_class=HTMLResponse)
+        async def index():
+            return "<html></html>"
+
+        client = TestClient(app)
+        assert "assets/s-1.js" in client.get("/").headers["link"]
+
+        manifest_path.write_text(
+            '{"src/main.ts": {"file": "assets/main-2.js", "imports": ["_s.js"]},'
+            ' "_s.js": {"file": "assets/s-2.js"}}'
+        )
+        st = manifest_path.stat()
+        os.utime(manifest_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+        assert client.get("/").headers["link"] == (
+            "</static/assets/s-2.js>; rel=modulepreload; crossorigin"
+        )
+
+    def test_shared_css_emitted_once_per_render(self, app, templates, tmp_path):
+        """Test that CSS shared by entries, blocks and includes is linked once."""
+        vite_dir = tmp_path / "dist" / ".vite"
+        vite_dir.mkdir(parents=True)
+        (vite_dir / "manifest.json").write_text(
+            '{"src/a.ts": {"file": "assets/a.js", "css": ["assets/shared.css"]},'
+            ' "src/b.ts": {"file": "assets/b.js",'
+            ' "css": ["assets/shared.css", "assets/b.css"]},'
+            ' "src/c.ts": {"file": "assets/c.js",'
+            ' "css": ["assets/shared.css", "assets/b.css", "assets/c.css"]}}'
+        )
+        config = ViteConfig(base_path=tmp_path, force_dev_mode=False)
+        setup_vite(app, templates, config)
+
+        templates_dir = tmp_path / "templates"
+        (templates_dir / "base.html").write_text(
+            '{{ vite_asset("src/a.ts") }}{% block content %}{% endblock %}'
+        )
+        (templates_dir / "page.html").write_text(
+            '{% extends "base.html" %}'
+            '{% block content %}{{ vite_asset("src/b.ts") }}'
+            '{% include "partial.html" %}{% endblock %}'
+        )
+        (templates_dir / "partial.html").write_text('{{ vite_asset("src/c.ts") }}')
+
+        template = templates.env.get_template("page.html")
+        for _ in range(2):
+            result = template.render()
+
+            assert result.count("assets/shared.css") == 1
+            assert "assets/a.js" in result
+            assert "assets/b.js" in result
+            assert result.count("assets/b.css") == 1
+            assert "assets/c.js" in result
+            assert "assets/c.css" in result
+
+    def test_shared_css_emitted_once_with_head_include(self, app, templates, tmp_path):
+        """Test dedupe when an include calls vite_asset() before its includer."""
+        vite_dir = tmp_path / "dist" / ".vite"
+        vite_dir.mkdir(parents=True)
+        (vite_dir / "manifest.json").write_text(
+            '{"src/a.ts": {"file": "assets/a.js", "css": ["assets/shared.css"]},'
+            ' "src/b.ts": {"file": "assets/b.js",'
+            ' "css": ["assets/shared.css", "assets/b.css"]}}'
+        )
+        setup_vite(app, templates, ViteConfig(base_path=tmp_path, force_dev_mode=False))
+
+        templates_dir = tmp_path / "templates"
+        (templates_dir / "head.html").write_text('{{ vite_asset("src/a.ts") }}')
+        (templates_dir / "page.html").write_text(
+            '<head>{% include "head.html" %}</head>'
+            '<body>{{ vite_asset("src/b.ts") }}</body>'
+        )
+
+        template = templates.env.get_template("page.html")
+        for _ in range(2):
+            result = template.render()
+
+            assert result.count("assets/shared.css") == 1
+            assert "assets/a.js" in result
+            assert "assets/b.js" in result
+            assert "assets/b.css" in result
+
+    def test_production_mode_optimizes_templates(self, app, templates, tmp_path):
+        """Test that production disables auto-reload without a bytecode cache."""
+        config = ViteConfig(base_path=tmp_path, force_dev_mode=False)
+
+        setup_vite(app, templates, config)
+
+        assert templates.env.auto_reload is False
+        assert templates.env.bytecode_cache is None
+
+    def test_bytecode_cache_dir(self, app, templates, tmp_path):
+        """Test that bytecode_cache_dir enables a cache in that directory."""
+        config = ViteConfig(
+            base_path=tmp_path, force_dev_mode=False, bytecode_cache_dir="jinja-cache"
+        )
+
+        setup_vite(app, templates, config)
+
+        assert templates.env.bytecode_cache.directory == str(tmp_path / "jinja-cache")
+        (tmp_path / "templates" / "page.html").write_text("hello")
+        assert templates.env.get_template("page.html").render() == "hello"
+        assert list((tmp_path / "jinja-cache").iterdir())
+
+    def test_bytecode_cache_dir_unusable(self, app, templates, tmp_path, caplog):
+        """Test that an unusable cache directory warns instead of failing setup."""
+        import logging
+
+        caplog.set_level(logging.WARNING)
+        (tmp_path / "not-a-dir").write_text("")
+        config = ViteConfig(
+            base_path=tmp_path,
+            force_dev_mode=False,
+            bytecode_cache_dir="not-a-dir/cache",
+        )
+
+        setup_vite(app, templates, config)
+
+        assert templates.env.auto_reload is False
+        assert templates.env.bytecode_cache is None
+        assert any(
+            "bytecode cache disabled" in record.message for record in caplog.records
+        )
+
+    def test_dev_mode_keeps_template_defaults(self, app, templates, tmp_path):
+        """Test that dev mode leaves template reloading enabled."""
+        config = ViteConfig(base_path=tmp_path, force_dev_mode=True)
+
+        setup_vite(app, templates, config)
+
+        assert templates.env.auto_reload is True
+        assert templates.env.bytecode_cache is None
+
+    def test_optimize_templates_disabled(self, app, templates, tmp_path):
+        """Test that optimize_templates=False leaves the environment alone."""
+        config = ViteConfig(
+            base_path=tmp_path,
+            force_dev_mode=False,
+            optimize_templates=False,
+            bytecode_cache_dir="jinja-cache",
+        )
+
+        setup_vite(app, templates, config)
+
+        assert templates.env.auto_reload is True
+        assert templates.env.bytecode_cache is None
+
     def test_custom_static_prefix(self, app, templates, manifest_path):
         """Test custom static URL prefix."""
         config = ViteConfig(
@@ -111,3 +111,290 @@ class TestViteManifest:
             "Loaded manifest with" in record.message and "entries" in record.message
             for record in caplog.records
         )
+
+    def test_load_is_cached_across_instances(self, manifest_path):
+        """Test that instances sharing a path reuse the parsed manifest."""
+        first = ViteManifest(manifest_path).load()
+        second = ViteManifest(manifest_path).load()
+
+        assert first is second
+
+    def test_load_reparses_when_mtime_changes(self, tmp_path):
+        """Test that a rebuilt manifest is re-read."""
+        import os
+
+        path = tmp_path / "manifest.json"
+        path.write_text('{"src/main.ts": {"file": "assets/main-old.js"}}')
+        assert ViteManifest(path).get_chunk("src/main.ts")["file"] == (
+            "assets/main-old.js"
+        )
+
+        path.write_text('{"src/main.ts": {"file": "assets/main-new.js"}}')
+        st = path.stat()
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+        assert ViteManifest(path).get_chunk("src/main.ts")["file"] == (
+            "assets/main-new.js"
+        )
+
+    def test_load_keeps_last_manifest_on_failed_reload(
+        self, tmp_path, caplog, monkeypatch
+    ):
+        """Test that a manifest broken or removed mid-build keeps the last one."""
+        import logging
+        import os
+
+        caplog.set_level(logging.ERROR)
+        path = tmp_path / "manifest.json"
+        path.write_text('{"src/main.ts": {"file": "assets/main.js"}}')
+        manifest = ViteManifest(path)
+        loaded = manifest.load()
+
+        def bump_mtime():
+            st = path.stat()
+            os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+        # Half-written file (not valid UTF-8 for the stdlib parser)
+        path.write_bytes(b'{"src/main.ts": {"file": "\xff')
+        bump_mtime()
+        assert manifest.load() is loaded
+
+        # Deleted between stat() and open()
+        from fastapi_vite_assets import manifest as manifest_module
+
+        def vanish(_path):
+            raise FileNotFoundError(_path)
+
+        bump_mtime()
+        with monkeypatch.context() as m:
+            m.setattr(manifest_module, "_read_manifest", vanish)
+            assert manifest.load() is loaded
+
+        # Deleted outright
+        path.unlink()
+        assert manifest.load() is loaded
+        assert manifest.get_chunk("src/main.ts")["file"] == "assets/main.js"
+        assert any("Failed to read manifest" in r.message for r in caplog.records)
+
+    def test_render_tags(self, manifest):
+        """Test rendering tag blocks for every entry."""
+        tags = manifest.render_tags("/static")
+
+        assert tags["src/main.ts"] == (
+            '<script type="module" src="/static/assets/main-D2jVR6rk.js"></script>'
+        )
+        assert tags["src/style.css"] == (
+            '<link rel="stylesheet" href="/static/assets/style-tzKEmwoM.css">'
+        )
+        assert 'href="/static/assets/app-styles-Abc456.css"' in tags["src/app.tsx"]
+
+    def test_render_tags_is_cached_per_prefix(self, manifest):
+        """Test that rendered tags are reused for the same prefix."""
+        assert manifest.render_tags("/static") is manifest.render_tags("/static")
+        assert manifest.render_tags("/assets") is not manifest.render_tags("/static")
+
+    def test_render_tags_shared_css(self, tmp_path):
+        """Test that CSS shared between chunks is rendered for each entry."""
+        path = tmp_path / "manifest.json"
+        path.write_text(
+            '{"src/a.ts": {"file": "assets/a.js", "css": ["assets/shared.css"]},'
+            ' "src/b.ts": {"file": "assets/b.js", "css": ["assets/shared.css"]}}'
+        )
+
+        tags = ViteManifest(path).render_tags("/static")
+
+        shared = '<link rel="stylesheet" href="/static/assets/shared.css">'
+        assert tags["src/a.ts"].endswith(shared)
+        assert tags["src/b.ts"].endswith(shared)
+
+    def test_load_shards(self, tmp_path):
+        """Test loading and merging split manifest files."""
+        (tmp_path / "manifest-a.json").write_text(
+            '{"src/a.ts": {"file": "assets/a.js"}}'
+        )
+        (tmp_path / "manifest-b.json").write_text(
+            '{"src/b.ts": {"file": "assets/b.js", "css": ["assets/b.css"]}}'
+        )
+
+        manifest = ViteManifest(tmp_path / "manifest.json", "manifest-*.json")
+        data = manifest.load()
+
+        assert set(data) == {"src/a.ts", "src/b.ts"}
+        assert manifest.exists()
+        assert manifest.get_chunk("src/b.ts")["css"] == ["assets/b.css"]
+        assert (
+            ViteManifest(tmp_path / "manifest.json", "manifest-*.json").load() is data
+        )
+
+    def test_load_shards_revalidates_with_directory_stat(self, tmp_path, monkeypatch):
+        """Test that cached shards are reused until the manifest directory changes."""
+        import os
+        from pathlib import Path
+
+        for name in "abc":
+            (tmp_path / f"manifest-{name}.json").write_text(
+                f'{{"src/{name}.ts": {{"file": "assets/{name}.js"}}}}'
+            )
+        manifest = ViteManifest(tmp_path / "manifest.json", "manifest-*.json")
+        data = manifest.load()
+
+        globs = []
+        original_glob = Path.glob
+
+        def counting_glob(self, pattern, *args, **kwargs):
+            globs.append(pattern)
+            return original_glob(self, pattern, *args, **kwargs)
+
+        monkeypatch.setattr(Path, "glob", counting_glob)
+        for _ in range(10):
+            assert manifest.load() is data
+        assert globs == []
+
+        (tmp_path / "manifest-d.json").write_text(
+            '{"src/d.ts": {"file": "assets/d.js"}}'
+        )
+        st = tmp_path.stat()
+        os.utime(tmp_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+        assert "src/d.ts" in manifest.load()
+        assert globs == ["manifest-*.json"]
+
+    def test_load_shards_none_match(self, tmp_path):
+        """Test loading shards when no files match the glob."""
+        manifest = ViteManifest(tmp_path / "manifest.json", "manifest-*.json")
+
+        assert manifest.load() == {}
+        assert not manifest.exists()
+
+    def test_load_shards_invalid_json(self, tmp_path, caplog):
+        """Test that an invalid shard logs an error."""
+        import logging
+
+        caplog.set_level(logging.ERROR)
+        (tmp_path / "manifest-a.json").write_text("invalid json{")
+
+        manifest = ViteManifest(tmp_path / "manifest.json", "manifest-*.json")
+
+        assert manifest.load() == {}
+        assert any(
+            "Failed to parse manifest shard" in record.message
+            for record in caplog.records
+        )
+
+    @pytest.fixture
+    def imports_manifest(self, tmp_path):
+        """Create a manifest whose entries share imported chunks."""
+        path = tmp_path / "manifest.json"
+        path.write_text(
+            '{"src/main.ts": {"file": "assets/main.js", "imports": ["_a.js", "_b.js"]},'
+            ' "_a.js": {"file": "assets/a.js", "imports": ["_b.js", "_c.js"]},'
+            ' "_b.js": {"file": "assets/b.js", "imports": ["_a.js"]},'
+            ' "_c.js": {"file": "assets/c.js"},'
+            ' "src/other.ts": {"file": "assets/other.js"}}'
+        )
+        return ViteManifest(path)
+
+    def test_collect_preload_files(self, imports_manifest):
+        """Test collecting transitive imports, visiting each chunk once."""
+        files = imports_manifest.collect_preload_files("src/main.ts")
+
+        assert files == ["assets/a.js", "assets/b.js", "assets/c.js"]
+
+    def test_collect_preload_files_missing_entry(self, imports_manifest):
+        """Test collecting imports for an unknown entry."""
+        assert imports_manifest.collect_preload_files("src/nope.ts") == []
+
+    def test_preload_headers(self, imports_manifest):
+        """Test building Link header values per entry."""
+        headers = imports_manifest.preload_headers("/static")
+
+        assert headers["src/main.ts"].startswith(
+            "</static/assets/a.js>; rel=modulepreload; crossorigin, "
+        )
+        assert "src/other.ts" not in headers
+        assert imports_manifest.preload_headers("/static") is headers
+
+    def test_load_classifies_chunk_kind(self, manifest):
+        """Test that chunks are classified as css or js when parsed."""
+        manifest.load()
+
+        assert manifest.get_chunk_info("src/main.ts").kind == "js"
+        assert manifest.get_chunk_info("src/style.css").kind == "css"
+        assert manifest.get_chunk_info("src/app.tsx").kind == "js"
+        assert manifest.get_chunk_info("src/nonexistent.ts") is None
+
+    def test_methods_read_one_manifest_snapshot(self, manifest, monkeypatch):
+        """Test that each method reads the manifest and its ChunkInfo together once."""
+        manifest.load()
+        snapshots = []
+        original = manifest._snapshot
+
+        def counting_snapshot():
+            snapshots.append(None)
+            return original()
+
+        monkeypatch.setattr(manifest, "_snapshot", counting_snapshot)
+
+        for method in (manifest.render_tags, manifest.preload_headers):
+            snapshots.clear()
+            method("/fresh-prefix")
+            assert len(snapshots) == 1
+
+    def test_load_leaves_chunks_unmodified(self, manifest_path):
+        """Test that parse-time classification is not written into chunks."""
+        import json
+
+        expected = json.loads(manifest_path.read_text())
+
+        assert ViteManifest(manifest_path).load() == expected
+
+    def test_load_large_manifest_memory_mapped(self, manifest_path, monkeypatch):
+        """Test that manifests over the size threshold load via mmap."""
+        pytest.importorskip("orjson")
+        from fastapi_vite_assets import manifest as manifest_module
+
+        mapped = []
+        real_mmap = manifest_module.mmap.mmap
+
+        def spy_mmap(*args, **kwargs):
+            mapped.append(args)
+            return real_mmap(*args, **kwargs)
+
+        monkeypatch.setattr(manifest_module.mmap, "mmap", spy_mmap)
+        monkeypatch.setattr(manifest_module, "_MMAP_THRESHOLD", 1)
+        data = ViteManifest(manifest_path).load()
+
+        assert len(mapped) == 1
+        assert data["src/main.ts"]["file"] == "assets/main-D2jVR6rk.js"
+
+    def test_load_small_manifest_not_memory_mapped(self, manifest_path, monkeypatch):
+        """Test that manifests under the size threshold are read, not mapped."""
+        from fastapi_vite_assets import manifest as manifest_module
+
+        def fail_mmap(*args, **kwargs):
+            raise AssertionError("mmap used for a small manifest")
+
+        monkeypatch.setattr(manifest_module.mmap, "mmap", fail_mmap)
+
+        assert "src/main.ts" in ViteManifest(manifest_path).load()
+
+    def test_load_classifies_chunk_flags(self, tmp_path):
+        """Test that chunks are flagged by whether they have CSS and imports."""
+        from fastapi_vite_assets.manifest import CHUNK_HAS_CSS, CHUNK_HAS_IMPORTS
+
+        path = tmp_path / "manifest.json"
+        path.write_text(
+            '{"src/leaf.ts": {"file": "assets/leaf.js"},'
+            ' "src/css.ts": {"file": "assets/css.js", "css": ["assets/a.css"]},'
+            ' "src/both.ts": {"file": "assets/both.js", "css": ["assets/b.css"],'
+            ' "imports": ["src/leaf.ts"]},'
+            ' "src/empty.ts": {"file": "assets/empty.js", "css": [], "imports": []}}'
+        )
+        manifest = ViteManifest(path)
+
+        assert manifest.get_chunk_info("src/leaf.ts").flags == 0
+        assert manifest.get_chunk_info("src/css.ts").flags == CHUNK_HAS_CSS
+        assert manifest.get_chunk_info("src/both.ts").flags == (
+            CHUNK_HAS_CSS | CHUNK_HAS_IMPORTS
+        )
+        assert manifest.get_chunk_info("src/empty.ts").flags == 0
@@ -0,0 +1,94 @@
+"""Tests for IndexedStaticFiles."""
+
+import os
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from fastapi_vite_assets.static_files import IndexedStaticFiles
+
+
+class TestIndexedStaticFiles:
+    """Test IndexedStaticFiles class."""
+
+    @pytest.fixture
+    def dist_dir(self, tmp_path):
+        """Create a build output directory."""
+        dist_dir = tmp_path / "dist"
+        (dist_dir / "assets").mkdir(parents=True)
+        (dist_dir / "assets" / "main.js").write_text("console.log('app');")
+        (dist_dir / "vite.svg").write_text("<svg></svg>")
+        return dist_dir
+
+    @pytest.fixture
+    def client(self, dist_dir):
+        """Create a client for an app serving dist_dir."""
+        app = FastAPI()
+        app.mount("/static", IndexedStaticFiles(directory=str(dist_dir)))
+        return TestClient(app)
+
+    def test_serves_indexed_files(self, client):
+        """Test that files present at startup are served."""
+        response = client.get("/static/assets/main.js")
+
+        assert response.status_code == 200
+        assert response.text == "console.log('app');"
+        assert client.get("/static/vite.svg").status_code == 200
+
+    def test_not_modified(self, client):
+        """Test that conditional requests still get 304 responses."""
+        etag = client.get("/static/vite.svg").headers["etag"]
+        response = client.get("/static/vite.svg", headers={"if-none-match": etag})
+
+        assert response.status_code == 304
+
+    def test_files_added_after_startup_not_served(self, client, dist_dir):
+        """Test that only files indexed at startup are served."""
+        (dist_dir / "late.js").write_text("late")
+
+        assert client.get("/static/late.js").status_code == 404
+
+    def test_missing_and_directory_paths(self, client):
+        """Test that unknown files and directories return 404."""
+        assert client.get("/static/nope.js").status_code == 404
+        assert client.get("/static/assets").status_code == 404
+
+    @pytest.mark.skipif(not hasattr(os, "symlink"), reason="requires symlinks")
+    def test_symlink_outside_directory_not_indexed(self, tmp_path, dist_dir):
+        """Test that symlinks escaping the directory are not served."""
+        secret = tmp_path / ".env"
+        secret.write_text("SECRET_KEY=12345")
+        (dist_dir / "leak.txt").symlink_to(secret)
+
+        app = FastAPI()
+        app.mount("/static", IndexedStaticFiles(directory=str(dist_dir)))
+        client = TestClient(app)
+
+        assert client.get("/static/leak.txt").status_code == 404
+
+    @pytest.mark.skipif(not hasattr(os, "symlink"), reason="requires symlinks")
+    def test_symlinked_directory_served(self, tmp_path, dist_dir):
+        """Test that symlinked subdirectories inside the directory are indexed."""
+        (dist_dir / "latest").symlink_to(dist_dir / "assets")
+        outside = tmp_path / "outside"
+        outside.mkdir()
+        (outside / "secret.txt").write_text("secret")
+        (dist_dir / "leak").symlink_to(outside)
+
+        app = FastAPI()
+        app.mount("/static", IndexedStaticFiles(directory=str(dist_dir)))
+        client = TestClient(app)
+
+        assert client.get("/static/latest/main.js").status_code == 200
+        assert client.get("/static/leak/secret.txt").status_code == 404
+
+    @pytest.mark.skipif(not hasattr(os, "symlink"), reason="requires symlinks")
+    def test_symlink_loop_terminates(self, dist_dir):
+        """Test that a directory symlink to an ancestor doesn't loop forever."""
+        (dist_dir / "assets" / "up").symlink_to(dist_dir)
+
+        files = IndexedStaticFiles(directory=str(dist_dir))
+
+        assert os.path.join("assets", "main.js") in files._index
+        assert os.path.join("assets", "up", "vite.svg") not in files._index
@@ -119,6 +119,42 @@ class TestViteTemplateHelpers:
         assert '<link rel="stylesheet"' in result_str
         assert 'href="/static/assets/app-styles-Abc456.css"' in result_str
 
+    def test_vite_asset_prod_mode_skips_emitted_css(self, prod_config):
+        """Test that already emitted stylesheets are not linked again."""
+        helpers = ViteTemplateHelpers(prod_config)
+        emitted: set[str] = set()
+
+        first = str(helpers.vite_asset("src/app.tsx", emitted))
+        second = str(helpers.vite_asset("src/app.tsx", emitted))
+
+        assert "assets/app-styles-Abc456.css" in first
+        assert "assets/app-styles-Abc456.css" not in second
+        assert 'src="/static/assets/app-BxYz123.js"' in second
+        assert emitted == {"assets/app-styles-Abc456.css"}
+
+    def test_vite_asset_prod_mode_reloads_rebuilt_manifest(self, tmp_path):
+        """Test that a rebuilt manifest is picked up on the next render."""
+        import os
+
+        manifest_path = tmp_path / "manifest.json"
+        manifest_path.write_text('{"src/main.ts": {"file": "assets/main-old.js"}}')
+        config = ViteConfig(
+            assets_path=".",
+            manifest_path="manifest.json",
+            base_path=tmp_path,
+            force_dev_mode=False,
+        )
+        helpers = ViteTemplateHelpers(config)
+        assert "assets/main-old.js" in str(helpers.vite_asset("src/main.ts"))
+
+        manifest_path.write_text('{"src/main.ts": {"file": "assets/main-new.js"}}')
+        st = manifest_path.stat()
+        os.utime(manifest_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+        result = str(helpers.vite_asset("src/main.ts"))
+        assert "assets/main-new.js" in result
+        assert "assets/main-old.js" not in result
+
     def test_vite_asset_prod_mode_missing(self, prod_config):
         """Test missing asset in production mode."""
         helpers = ViteTemplateHelpers(prod_config)